@@ -107,17 +107,21 @@ async def subprocess_run(
     input: Optional[Union[str, bytes]] = None,
     capture_output: bool = False,
 ) -> CompletedAsyncProcess:
-    """Run a subprocess with async. Tries to mirror the subprocess.run API."""
-    if not isinstance(command, str):
-        shell_command = " ".join(command)
-    else:
-        shell_command = command
-    proc = await asyncio.create_subprocess_shell(
-        shell_command,
+    """Run a subprocess with async. Tries to mirror the subprocess.run API.
+
+    Like `subprocess.run`, a string command is run through the shell while a
+    sequence of arguments is executed directly. This avoids an extra shell
+    process and means the arguments don't need to be quoted.
+    """
+    pipes = dict(
         stdin=asyncio.subprocess.PIPE,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
+    if isinstance(command, str):
+        proc = await asyncio.create_subprocess_shell(command, **pipes)
+    else:
+        proc = await asyncio.create_subprocess_exec(*command, **pipes)
     if input is not None:
         stdout, stderr = await proc.communicate(input=six.ensure_binary(input))
     else:
@@ -1,9 +1,14 @@
 """Checkpoints that use a pickled dict format like pytorch."""
 
+import inspect
 import io
+import pickle
+import zipfile
 
 import torch
+from file_or_name import file_or_name
 
+from git_theta import utils
 from git_theta.checkpoints import Checkpoint
 
 
@@ -27,12 +32,29 @@ class PickledDictCheckpoint(Checkpoint):
         model_dict : dict
             Dictionary mapping parameter names to parameter values
         """
+        load_kwargs = {}
+        torch_load_args = inspect.signature(torch.load).parameters
+        # Older versions of torch don't support restricting unpickling to
+        # tensors and plain containers.
+        if "weights_only" in torch_load_args:
+            load_kwargs["weights_only"] = True
         if isinstance(checkpoint_path, io.IOBase):
             checkpoint_path = io.BytesIO(checkpoint_path.read())
+        # When we have an actual file on disk, back the tensor storage with the
+        # file via mmap so values are paged in lazily instead of being read into
+        # memory all at once. Only the zipfile serialization format can be mmap'd.
+        elif "mmap" in torch_load_args and zipfile.is_zipfile(checkpoint_path):
+            load_kwargs["mmap"] = True
 
         # Map all values to the CPU as they may bave been saved to the GPU and we don't
         # know if the same GPU topology is available now.
-        model_dict = torch.load(checkpoint_path, map_location=torch.device("cpu"))
+        try:
+            model_dict = torch.load(
+                checkpoint_path, map_location=torch.device("cpu"), **load_kwargs
+            )
+        # Raised by `weights_only` when the checkpoint contains arbitrary objects.
+        except pickle.UnpicklingError as e:
+            raise ValueError("All PyTorch checkpoint values must be tensors.") from e
         if not isinstance(model_dict, dict):
             raise ValueError("Supplied PyTorch checkpoint must be a dict.")
         if not all(isinstance(k, str) for k in model_dict.keys()):
@@ -50,6 +72,7 @@ class PickledDictCheckpoint(Checkpoint):
     def to_framework(self):
         return {k: torch.as_tensor(v) for k, v in self.items()}
 
+    @file_or_name(checkpoint_path="wb")
     def save(self, checkpoint_path):
         """Load a checkpoint into a dict format.
 
@@ -59,4 +82,12 @@ class PickledDictCheckpoint(Checkpoint):
             Path to write out the checkpoint file to
         """
         checkpoint_dict = self.to_framework()
-        torch.save(checkpoint_dict, checkpoint_path)
+        # Buffering needs memory for a second copy of the checkpoint.
+        if utils.EnvVarConstants.LOW_MEMORY:
+            torch.save(checkpoint_dict, checkpoint_path)
+            return
+        # torch.save does many small writes as it builds the zip archive, so
+        # serialize in memory and write everything out at once.
+        buffer = io.BytesIO()
+        torch.save(checkpoint_dict, buffer)
+        checkpoint_path.write(buffer.getbuffer())
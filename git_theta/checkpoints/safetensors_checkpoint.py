@@ -5,25 +5,32 @@ and read "safetensors" -> any "dl-native" framework, not just the one that was
 used to write it. Therefore, we read/write with their numpy API.
 """
 
+import io
+
+import safetensors
 import safetensors.numpy
 from file_or_name import file_or_name
 
 from git_theta.checkpoints import Checkpoint
 
 
-# TODO(bdlester): Can we leverage the lazying loading ability to make things faster?
 class SafeTensorsCheckpoint(Checkpoint):
     """Class for r/w of the safetensors format. https://github.com/huggingface/safetensors"""
 
     name: str = "safetensors"
 
     @classmethod
-    @file_or_name(checkpoint_path="rb")
     def load(cls, checkpoint_path: str):
         # Note that we use the numpy as the framework because we don't care what
         # their downstream dl framework is, we only want the results back as
         # numpy arrays.
-        return safetensors.numpy.load(checkpoint_path.read())
+        if isinstance(checkpoint_path, io.IOBase):
+            return safetensors.numpy.load(checkpoint_path.read())
+        # When the checkpoint is on disk, safe_open mmaps the file so each tensor
+        # is copied out one at a time instead of first reading the whole file
+        # into memory.
+        with safetensors.safe_open(checkpoint_path, framework="numpy") as f:
+            return {k: f.get_tensor(k) for k in f.keys()}
 
     @file_or_name(checkpoint_path="wb")
     def save(self, checkpoint_path: str):
@@ -37,6 +37,10 @@ def clean(
         param_metadata = prev_metadata.get(param_keys)
         # Create new metadata from the current value
         logger.debug(f"Making new Metadata for {'/'.join(param_keys)}")
+        # When parameters aren't stored exactly, compare and write the value that
+        # will be checked out so an unchanged parameter matches its metadata.
+        if update_serializer.lossy:
+            new_param = update_handler.stored_value(new_param)
         new_tensor_metadata = metadata.TensorMetadata.from_tensor(new_param)
         logger.debug(f"Finished new Metadata for {'/'.join(param_keys)}")
 
@@ -4,6 +4,7 @@ import copy
 import dataclasses
 import filecmp
 import fnmatch
+import functools
 import io
 import json
 import logging
@@ -12,7 +13,8 @@ import re
 import shutil
 import subprocess
 import sys
-from typing import Dict, List, Optional, Sequence, Union
+import tempfile
+from typing import Dict, List, Optional, Sequence, Set, Union
 
 import git
 import gitdb
@@ -26,8 +28,6 @@ if sys.version_info < (3, 9):
 else:
     import importlib.resources as importlib_resources
 
-from file_or_name import file_or_name
-
 from git_theta import async_utils
 
 # These are the git attributes that git-theta currently uses to manage checked-in
@@ -52,18 +52,39 @@ def get_git_repo():
     git.Repo
         Repo object for the current git repository
     """
-    return git.Repo(os.getcwd(), search_parent_directories=True)
+    return _get_git_repo(os.getcwd())
+
+
+# Finding the repo walks up the filesystem looking for .git, so cache it based
+# on the working directory as it is requested many times in a single process.
+# Only a few are kept as each open Repo can hold onto git cat-file processes.
+@functools.lru_cache(maxsize=4)
+def _get_git_repo(path: str) -> git.Repo:
+    return git.Repo(path, search_parent_directories=True)
+
+
+def clear_caches():
+    """Drop cached repos, e.g. after a repo is deleted or recreated."""
+    _get_git_repo.cache_clear()
 
 
 def set_hooks():
     repo = get_git_repo()
     hooks_dir = os.path.join(repo.git_dir, "hooks")
+    # Repos created with an empty template don't have a hooks directory.
+    os.makedirs(hooks_dir, exist_ok=True)
     package = importlib_resources.files("git_theta")
     for hook in ["pre-push", "post-commit"]:
         with importlib_resources.as_file(package.joinpath("hooks", hook)) as hook_src:
             hook_dst = os.path.join(hooks_dir, hook)
-            if not (os.path.exists(hook_dst) and filecmp.cmp(hook_src, hook_dst)):
-                shutil.copy(hook_src, hook_dst)
+            try:
+                up_to_date = filecmp.cmp(hook_src, hook_dst)
+            except FileNotFoundError:
+                up_to_date = False
+            if not up_to_date:
+                # Preserve the modification time so future checks can match on
+                # `os.stat` signatures without reading both files.
+                shutil.copy2(hook_src, hook_dst)
 
 
 def get_relative_path_from_root(repo, path):
@@ -156,11 +177,13 @@ def read_gitattributes(gitattributes_file) -> List[GitAttributes]:
     List[str]
         lines in .gitattributes file
     """
-    if os.path.exists(gitattributes_file):
+    try:
         with open(gitattributes_file, "r") as f:
-            return [parse_gitattributes(line.rstrip("\n")) for line in f]
-    else:
+            # Read the whole (small) file at once and split in C.
+            lines = f.read().splitlines()
+    except FileNotFoundError:
         return []
+    return [parse_gitattributes(line) for line in lines]
 
 
 def parse_gitattributes(gitattributes: str) -> GitAttributes:
@@ -182,13 +205,15 @@ def parse_gitattributes(gitattributes: str) -> GitAttributes:
     return GitAttributes(pattern, attrs, gitattributes)
 
 
-@file_or_name(gitattributes_file="w")
 def write_gitattributes(
     gitattributes_file: Union[str, io.FileIO], attributes: List[GitAttributes]
 ):
     """
     Write list of attributes to this repo's .gitattributes file
 
+    When given a path, the attributes are written to a temporary file that is
+    then moved into place so .gitattributes is never left half-written.
+
     Parameters
     ----------
     gitattributes_file:
@@ -197,9 +222,31 @@ def write_gitattributes(
     attributes:
         Attributes to write to .gitattributes
     """
-    gitattributes_file.write("\n".join(map(str, attributes)))
     # End file with newline.
-    gitattributes_file.write("\n")
+    contents = "\n".join(map(str, attributes)) + "\n"
+    if not isinstance(gitattributes_file, (str, os.PathLike)):
+        gitattributes_file.write(contents)
+        return
+    # Replace the file a symlinked .gitattributes points to, not the link itself.
+    gitattributes_file = os.path.realpath(gitattributes_file)
+    fd, tmp_file = tempfile.mkstemp(
+        dir=os.path.dirname(gitattributes_file), prefix=".gitattributes."
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(contents)
+        try:
+            shutil.copymode(gitattributes_file, tmp_file)
+        except FileNotFoundError:
+            # mkstemp creates the file as owner-only, give a new .gitattributes
+            # the permissions open() would have.
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_file, 0o666 & ~umask)
+        os.replace(tmp_file, gitattributes_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
 
 
 def add_theta_to_gitattributes(
@@ -272,18 +319,25 @@ def add_theta_to_gitattributes(
 
 def get_gitattributes_tracked_patterns(
     gitattributes_file, theta_attributes: Sequence[str] = THETA_ATTRIBUTES
-):
-    gitattributes = read_gitattributes(gitattributes_file)
-    theta_attributes = [
-        attr
-        for attr in gitattributes
-        if attr.attributes.get(a) == "theta"
-        for a in theta_attributes
-    ]
-    return [attr.pattern for attr in theta_attributes]
+) -> Set[str]:
+    """Get the patterns in .gitattributes that set all git-theta attributes.
+
+    Parameters
+    ----------
+    gitattributes_file:
+        Path to this repo's .gitattributes file
+
+    Returns
+    -------
+    Set[str]
+        The patterns, as a set so they can be used for quick membership checks.
+    """
     # TODO: Correctly handle patterns with escaped spaces in them
-    patterns = [attribute.split(" ")[0] for attribute in theta_attributes]
-    return patterns
+    return {
+        attr.pattern
+        for attr in read_gitattributes(gitattributes_file)
+        if all(attr.attributes.get(a) == "theta" for a in theta_attributes)
+    }
 
 
 def is_theta_tracked(
@@ -314,9 +368,40 @@ def add_file(f, repo):
     repo : git.Repo
         Repo object for current git repository
     """
+    add_files([f], repo)
+
+
+def add_files(paths: Sequence[str], repo):
+    """
+    Add multiple files to git staging area with a single git command
+
+    The paths are streamed to `git update-index` so the index is only rewritten
+    once, no matter how many files are added. Unlike `git add`, .gitignore rules
+    are not applied so ignored files are staged too.
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        paths to files
+    repo : git.Repo
+        Repo object for current git repository
+    """
+    if not paths:
+        return
     logger = logging.getLogger("git_theta")
-    logger.debug(f"Adding {f} to staging area")
-    repo.git.add(f)
+    logger.debug(f"Adding {', '.join(paths)} to staging area")
+    paths = [get_relative_path_from_root(repo, path) for path in paths]
+    # --remove matches `git add` by staging the deletion of a removed file.
+    command = ["git", "update-index", "--add", "--remove", "-z", "--stdin"]
+    result = subprocess.run(
+        command,
+        input=b"\0".join(os.fsencode(path) for path in paths),
+        cwd=repo.working_dir,
+        capture_output=True,
+    )
+    # Raise the same error as the other GitPython based git calls.
+    if result.returncode != 0:
+        raise git.GitCommandError(command, result.returncode, result.stderr)
 
 
 def remove_file(f, repo):
@@ -357,6 +442,47 @@ def get_file_version(repo, path: str, commit_hash_or_tag: Union[str, git.Commit]
         return None
 
 
+def get_changed_files(repo, commit: git.Commit) -> List[str]:
+    """Get the paths of files changed in a commit.
+
+    This matches the files in `commit.stats` but only asks git for the names,
+    `commit.stats` calculates line counts by diffing the contents of each file.
+
+    Parameters
+    ----------
+    repo : git.Repo
+        Repo object for the current git repository
+    commit :
+        The commit to list the changed files for.
+
+    Returns
+    -------
+    List[str]
+        Paths, relative to the repo root, of files changed in `commit`.
+    """
+    if commit.parents:
+        changed = repo.git.diff(
+            commit.parents[0].hexsha,
+            commit.hexsha,
+            "--",
+            name_only=True,
+            no_renames=True,
+            z=True,
+        )
+    else:
+        changed = repo.git.diff_tree(
+            commit.hexsha,
+            "--",
+            name_only=True,
+            no_renames=True,
+            root=True,
+            no_commit_id=True,
+            r=True,
+            z=True,
+        )
+    return [path for path in changed.split("\0") if path]
+
+
 def get_head(repo):
     try:
         head = repo.commit("HEAD")
@@ -386,7 +512,7 @@ async def git_lfs_smudge(pointer_file: str) -> bytes:
 async def git_lfs_push_oids(remote_name: str, oids: Sequence[str]) -> int:
     if oids:
         out = await async_utils.subprocess_run(
-            ["git", "lfs", "push", "--object-id", re.escape(remote_name)] + list(oids),
+            ["git", "lfs", "push", "--object-id", remote_name] + list(oids),
         )
         return out.returncode
     return 0
@@ -407,6 +533,10 @@ def is_git_lfs_installed():
     """
     Helper function that checks if git-lfs is installed to prevent future errors with git-theta
     """
+    # Finding git-lfs on the PATH avoids starting the git-lfs binary, fall back
+    # to running it for installs git can find elsewhere (i.e. git's exec-path).
+    if shutil.which("git-lfs") is not None:
+        return True
     try:
         results = subprocess.run(
             ["git", "lfs", "version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
@@ -114,7 +114,8 @@ class Metadata(OrderedDict):
     @classmethod
     @file_or_name(file="r")
     def from_file(cls, file: TextIO) -> Metadata:
-        metadata_dict = json.load(file)
+        # Read the whole file at once and parse from the buffer.
+        metadata_dict = utils.load_json(file.read())
         return cls.from_metadata_dict(metadata_dict)
 
     @classmethod
@@ -180,3 +181,40 @@ class MetadataEncoder(json.JSONEncoder):
             return obj.tolist()
         else:
             return json.JSONEncoder.default(self, obj)
+
+
+# Every parameter with an incremental update looks up the metadata from the
+# commit where it was last changed and these are often the same commit. The
+# metadata at a specific commit can't change, so cache it instead of reading and
+# parsing the whole file again for each parameter. Entries are keyed on the
+# repo's git directory instead of the Repo object so the cache doesn't keep
+# repos, and their git processes, alive.
+_FLAT_METADATA_CACHE: "OrderedDict[Tuple[str, str, str], Metadata]" = OrderedDict()
+_FLAT_METADATA_CACHE_SIZE = 128
+
+
+def get_flat_metadata(repo: git.Repo, path: str, commit_hash: str) -> Metadata:
+    """Get the flattened metadata for `path` at `commit_hash`.
+
+    Note: The result is shared between callers and should not be modified.
+    """
+    key = (
+        repo.git_dir,
+        git_utils.get_relative_path_from_root(repo, path),
+        commit_hash,
+    )
+    if key in _FLAT_METADATA_CACHE:
+        _FLAT_METADATA_CACHE.move_to_end(key)
+        return _FLAT_METADATA_CACHE[key]
+    metadata_obj = git_utils.get_file_version(repo, path, commit_hash)
+    flat_metadata = Metadata.from_file(metadata_obj.data_stream).flatten()
+    _FLAT_METADATA_CACHE[key] = flat_metadata
+    # Drop the least recently used entry.
+    if len(_FLAT_METADATA_CACHE) > _FLAT_METADATA_CACHE_SIZE:
+        _FLAT_METADATA_CACHE.popitem(last=False)
+    return flat_metadata
+
+
+def clear_caches():
+    """Drop cached metadata, e.g. after a repo is deleted or recreated."""
+    _FLAT_METADATA_CACHE.clear()
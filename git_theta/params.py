@@ -1,14 +1,38 @@
 """Classes for serializing model updates."""
 
+import json
 from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Optional
 
+import ml_dtypes
 import msgpack
+import numpy as np
 import tensorstore as ts
 
+from git_theta import utils
+
+
+class StoredTensor(np.ndarray):
+    """A tensor with the value it will have after a lossy serialization.
+
+    `storage` holds the converted values that are actually written so they can
+    be serialized without converting the tensor again. The result of operations
+    on a StoredTensor don't have `storage` set.
+    """
+
+    storage: Optional[np.ndarray] = None
+
 
 class TensorSerializer(metaclass=ABCMeta):
     """Serialize/Deserialize tensors."""
 
+    # Whether deserializing can give back a different value than was serialized.
+    lossy: bool = False
+
+    def stored_value(self, tensor):
+        """The value a tensor will have after being serialized and deserialized."""
+        return tensor
+
     @abstractmethod
     async def serialize(self, tensor):
         """Convert a tensor to bytes."""
@@ -19,19 +43,78 @@ class TensorSerializer(metaclass=ABCMeta):
 
 
 class TensorStoreSerializer(TensorSerializer):
+    # zstd is about as fast as tensorstore's default (blosc-lz4) and gives much
+    # smaller results for the sparse/low-precision values that are common in
+    # parameter updates. The compressor is recorded in the zarr metadata so
+    # values written with other compressors can still be read.
+    DEFAULT_COMPRESSOR = {"id": "zstd", "level": 3}
+    # Zarr user attributes, used to record the original dtype of a tensor.
+    ATTRIBUTES_KEY = ".zattrs"
+
+    def __init__(
+        self,
+        compressor: Optional[Dict[str, Any]] = None,
+        storage_dtype: Optional[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        compressor:
+            The zarr compressor to use, defaults to zstd.
+        storage_dtype:
+            If set, floating point tensors are converted to this (lower
+            precision) dtype, i.e. "bfloat16" or "float8_e4m3fn", before they
+            are stored and converted back when they are read. This is lossy and
+            values outside of the dtype's finite range raise a ValueError.
+            Defaults to $GIT_THETA_STORAGE_DTYPE.
+        """
+        self.compressor = compressor or self.DEFAULT_COMPRESSOR
+        self.storage_dtype = storage_dtype or utils.EnvVarConstants.STORAGE_DTYPE
+
+    @property
+    def lossy(self) -> bool:
+        return bool(self.storage_dtype)
+
+    def casts(self, tensor) -> bool:
+        """Whether this tensor is stored as the storage dtype."""
+        return bool(self.storage_dtype) and np.issubdtype(tensor.dtype, np.floating)
+
+    def stored_value(self, tensor):
+        if not self.casts(tensor):
+            return tensor
+        storage = self.to_storage_dtype(tensor)
+        stored = storage.astype(tensor.dtype).view(StoredTensor)
+        stored.storage = storage
+        return stored
+
     async def serialize(self, tensor):
+        serialized_param = {}
+        dtype = tensor.dtype.str
+        if self.casts(tensor):
+            serialized_param[self.ATTRIBUTES_KEY] = json.dumps(
+                {"original_dtype": tensor.dtype.str}
+            ).encode("utf-8")
+            if isinstance(tensor, StoredTensor) and tensor.storage is not None:
+                tensor = tensor.storage
+            else:
+                tensor = self.to_storage_dtype(tensor)
+            dtype = zarr_dtype(self.storage_dtype)
         store = await ts.open(
             {
                 "driver": "zarr",
                 "kvstore": {"driver": "memory"},
-                "metadata": {"shape": tensor.shape, "dtype": tensor.dtype.str},
+                "metadata": {
+                    "shape": tensor.shape,
+                    "dtype": dtype,
+                    "compressor": self.compressor,
+                },
                 "create": True,
             },
         )
         await store.write(tensor)
-        serialized_param = {
-            k.decode("utf-8"): store.kvstore[k] for k in await store.kvstore.list()
-        }
+        serialized_param.update(
+            {k.decode("utf-8"): store.kvstore[k] for k in await store.kvstore.list()}
+        )
         return serialized_param
 
     async def deserialize(self, serialized_tensor):
@@ -42,8 +125,39 @@ class TensorStoreSerializer(TensorSerializer):
 
         store = await ts.open({"driver": "zarr", "kvstore": "memory://"}, context=ctx)
         param = await store.read()
+        if self.ATTRIBUTES_KEY in serialized_tensor:
+            attributes = json.loads(serialized_tensor[self.ATTRIBUTES_KEY])
+            if "original_dtype" in attributes:
+                param = param.astype(attributes["original_dtype"])
         return param
 
+    def to_storage_dtype(self, tensor):
+        """Convert a tensor to the storage dtype, checking that it fits."""
+        storage_dtype = np.dtype(ts.dtype(self.storage_dtype).numpy_dtype)
+        # Casting doesn't saturate, out of range values become inf or, for types
+        # without an inf like float8_e4m3fn, nan.
+        max_value = ml_dtypes.finfo(storage_dtype).max
+        if np.max(np.abs(tensor), where=np.isfinite(tensor), initial=0) > max_value:
+            raise ValueError(
+                f"Tensor has values outside of the range of the storage dtype "
+                f"{self.storage_dtype} (+/-{max_value}), unset "
+                "GIT_THETA_STORAGE_DTYPE or use a dtype with a larger range."
+            )
+        return tensor.astype(storage_dtype)
+
+
+def zarr_dtype(dtype: str) -> str:
+    """Convert a dtype name to the one used in zarr metadata.
+
+    Standard dtypes use the numpy type string (i.e. "<f2") while extension types
+    that tensorstore supports, like "bfloat16", use their name.
+    """
+    numpy_dtype = np.dtype(ts.dtype(dtype).numpy_dtype)
+    # Extension types don't have a numpy type string, they show up as raw bytes.
+    if numpy_dtype.kind == "V":
+        return dtype
+    return numpy_dtype.str
+
 
 class FileCombiner(metaclass=ABCMeta):
     """Combine and Split serialized tensors, enables single blob processing for multiple tensors."""
@@ -68,6 +182,13 @@ class MsgPackCombiner(FileCombiner):
 class Serializer(metaclass=ABCMeta):
     """Serialize/Deserialize parameters, even when represented with multiple tensors."""
 
+    # Whether deserializing can give back a different value than was serialized.
+    lossy: bool = False
+
+    def stored_value(self, params):
+        """The value parameters will have after being serialized and deserialized."""
+        return params
+
     @abstractmethod
     async def serialize(self, params):
         """Serialize parameter."""
@@ -82,6 +203,15 @@ class UpdateSerializer(Serializer):
         self.serializer = tensor_serializer
         self.combiner = file_combiner
 
+    @property
+    def lossy(self) -> bool:
+        return self.serializer.lossy
+
+    def stored_value(self, params):
+        return {
+            name: self.serializer.stored_value(param) for name, param in params.items()
+        }
+
     async def serialize(self, params):
         serialized_params = {
             name: await self.serializer.serialize(param)
@@ -96,16 +96,21 @@ def post_commit(args):
 
     oids = set()
     commit = repo.commit("HEAD")
-    for path in commit.stats.files.keys():
+    for path in git_utils.get_changed_files(repo, commit):
         if git_utils.is_theta_tracked(path, gitattributes):
-            curr_metadata = metadata.Metadata.from_file(commit.tree[path].data_stream)
-            prev_metadata = metadata.Metadata.from_commit(repo, path, "HEAD~1")
-
-            added, removed, modified = curr_metadata.diff(prev_metadata)
-            oids.update([param.lfs_metadata.oid for param in added.flatten().values()])
-            oids.update(
-                [param.lfs_metadata.oid for param in modified.flatten().values()]
-            )
+            curr_metadata = metadata.Metadata.from_file(
+                commit.tree[path].data_stream
+            ).flatten()
+            prev_metadata = metadata.Metadata.from_commit(
+                repo, path, "HEAD~1"
+            ).flatten()
+
+            # Only added and modified parameters have new LFS objects so we can
+            # skip the rest of the diff (i.e. figuring out removed parameters).
+            for param_keys, param in curr_metadata.items():
+                prev_param = prev_metadata.get(param_keys)
+                if prev_param is None or prev_param.lfs_metadata != param.lfs_metadata:
+                    oids.add(param.lfs_metadata.oid)
 
     commit_info = theta.CommitInfo(oids)
     theta_commits.write_commit_info(commit.hexsha, commit_info)
@@ -202,8 +207,12 @@ def track(args):
 
     gitattributes_file = git_utils.get_gitattributes_file(repo)
     gitattributes = git_utils.read_gitattributes(gitattributes_file)
+    num_gitattributes = len(gitattributes)
 
     new_gitattributes = git_utils.add_theta_to_gitattributes(gitattributes, model_path)
+    # The path is already tracked by an existing pattern, nothing to update.
+    if len(new_gitattributes) == num_gitattributes:
+        return
 
     git_utils.write_gitattributes(gitattributes_file, new_gitattributes)
     git_utils.add_file(gitattributes_file, repo)
@@ -24,13 +24,14 @@ class CommitInfo:
     @classmethod
     @file_or_name(f="r")
     def from_file(cls, f):
-        commit_info_dict = json.load(f)
+        commit_info_dict = utils.load_json(f.read())
         return cls(commit_info_dict.get("oids"))
 
     @file_or_name(f="w")
     def write(self, f):
         commit_info_dict = {"oids": list(self.oids)}
-        json.dump(commit_info_dict, f, indent=4)
+        # Serialize to a string first, `json.dump` issues a write per token.
+        f.write(json.dumps(commit_info_dict, indent=4))
 
 
 class ThetaCommits:
@@ -51,9 +52,12 @@ class ThetaCommits:
 
     def get_commit_info(self, commit_hash):
         path = self.get_commit_path(commit_hash)
-        if not (os.path.exists(path) and os.path.isfile(path)):
+        # Just try to open the file instead of stat-ing it first, this is called
+        # for every commit in the range being pushed.
+        try:
+            commit = CommitInfo.from_file(path)
+        except (FileNotFoundError, IsADirectoryError):
             raise ValueError(f"commit {commit_hash} is not found in {self.path}")
-        commit = CommitInfo.from_file(path)
         return commit
 
     def get_commit_info_range(self, start_hash, end_hash):
@@ -97,8 +101,11 @@ class ThetaCommits:
         if not utils.is_valid_commit_hash(commit_hash):
             raise ValueError(f"Cannot write commit info for invalid hash {commit_hash}")
         path = self.get_commit_path(commit_hash)
-        if os.path.exists(path):
+        # Exclusive creation checks for an existing file and creates it atomically.
+        try:
+            with open(path, "x") as f:
+                commit_info.write(f)
+        except FileExistsError:
             raise ValueError(
                 f"Cannot duplicate commit info at {path}. Something is wrong!"
             )
-        commit_info.write(path)
@@ -39,6 +39,12 @@ class Update(metaclass=ABCMeta):
     def will_update(self, param_keys: Tuple[str]) -> bool:
         return False
 
+    def stored_value(self, param: Parameter) -> Parameter:
+        """The value of `param` as `read` will return it after it is written."""
+        if not isinstance(param, dict):
+            return self.serializer.stored_value({"parameter": param})["parameter"]
+        return self.serializer.stored_value(param)
+
     @abstractmethod
     async def write(
         self, param: Parameter, param_keys: Tuple[str], **kwargs
@@ -103,9 +109,8 @@ class IncrementalUpdate(Update):
         self.logger.debug(
             f"Getting metadata for {'/'.join(param_keys)} from commit {last_commit}"
         )
-        last_metadata_obj = git_utils.get_file_version(repo, path, last_commit)
-        last_metadata = metadata.Metadata.from_file(last_metadata_obj.data_stream)
-        last_param_metadata = last_metadata.flatten()[param_keys]
+        last_metadata = metadata.get_flat_metadata(repo, path, last_commit)
+        last_param_metadata = last_metadata[param_keys]
         self.logger.debug(
             f"Previous Metadata for {'/'.join(param_keys)}: {last_param_metadata}"
         )
@@ -181,8 +186,11 @@ class IncrementalUpdate(Update):
             update_value = await self.read_update(param_keys)
             # Calculate and hash the *new* value so that we can update the
             # metadata when using side-loaded information.
-            new_value = await self.apply_update(update_value, previous_value)
-            new_hash = lsh.get_lsh().hash(new_value)
+            new_value = await self.apply_update(
+                self.stored_value(update_value), previous_value
+            )
+            # Hash it the same way `clean` hashes a checked out value.
+            new_hash = lsh.get_lsh().hash(self.stored_value(new_value))
             return await self.write_update(update_value), new_hash
         else:
             update_value = await self.calculate_update(param, previous_value)
@@ -4,6 +4,7 @@ import dataclasses
 import datetime
 import functools
 import inspect
+import json
 import os
 import re
 import subprocess
@@ -12,6 +13,11 @@ from enum import Enum
 from types import MethodType
 from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def _format(self, value, tag):
     """Wrap `value` in HTML like <tag>s."""
@@ -79,10 +85,17 @@ class EnvVarConstants:
     LSH_SIGNATURE_SIZE = EnvVar(name="GIT_THETA_LSH_SIGNATURE_SIZE", default=16)
     LSH_THRESHOLD = EnvVar(name="GIT_THETA_LSH_THRESHOLD", default=1e-6)
     LSH_POOL_SIZE = EnvVar(name="GIT_THETA_LSH_POOL_SIZE", default=10_000)
-    MAX_CONCURRENCY = EnvVar(name="GIT_THETA_MAX_CONCURRENCY", default=-1)
+    # Parameters are cleaned/smudged concurrently, each running its own git-lfs
+    # process. Bound how many are in flight at once (the same heuristic as
+    # ThreadPoolExecutor) so large models don't spawn a process per parameter
+    # all at once. Values <= 0 remove the limit.
+    MAX_CONCURRENCY = EnvVar(
+        name="GIT_THETA_MAX_CONCURRENCY", default=min(32, (os.cpu_count() or 1) * 2)
+    )
     MANUAL_MERGE = EnvVar(name="GIT_THETA_MANUAL_MERGE", default=False)
     LOG_LEVEL = EnvVar(name="GIT_THETA_LOG_LEVEL", default="DEBUG")
     LOW_MEMORY = EnvVar(name="GIT_THETA_LOW_MEMORY", default=False)
+    STORAGE_DTYPE = EnvVar(name="GIT_THETA_STORAGE_DTYPE", default="")
 
 
 def flatten(
@@ -104,16 +117,23 @@ def flatten(
         dictionary.
     """
 
-    def _flatten(d, prefix: Tuple[str] = ()):
-        flat = type(d)({})
-        for k, v in d.items():
-            if not is_leaf(v):
-                flat.update(_flatten(v, prefix=prefix + (k,)))
-            else:
+    flat = type(d)({})
+    # Walk the nested dicts with an explicit stack of iterators so leaves are
+    # written directly into the result, instead of building (and copying) a
+    # flattened dict at every level of nesting. Keys are still emitted in the
+    # same depth-first, insertion order as the nested dict.
+    stack = [((), iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            if is_leaf(v):
                 flat[prefix + (k,)] = v
-        return flat
-
-    return _flatten(d)
+            else:
+                stack.append((prefix + (k,), iter(v.items())))
+                break
+        else:
+            stack.pop()
+    return flat
 
 
 def unflatten(d: Dict[Tuple[str, ...], Any]) -> Dict[str, Union[Dict[str, Any], Any]]:
@@ -138,6 +158,29 @@ def unflatten(d: Dict[Tuple[str, ...], Any]) -> Dict[str, Union[Dict[str, Any],
     return nested
 
 
+def load_json(contents: Union[str, bytes]) -> Any:
+    """Parse json, using orjson when it is installed.
+
+    Parameters
+    ----------
+    contents:
+        The full contents of a json file.
+
+    Returns
+    -------
+    Any
+        The parsed json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(contents)
+        # orjson is stricter than the standard library, i.e. it doesn't allow
+        # NaN, so fall back to json for anything it can't handle.
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(contents)
+
+
 def is_valid_oid(oid: str) -> bool:
     """Check if an LFS object-id is valid
 
@@ -94,6 +94,7 @@ setup(
         "scipy",
         "numba",
         "msgpack",
+        "ml_dtypes",
         'importlib_resources; python_version < "3.9.0"',
         'importlib_metadata; python_version < "3.10.0"',
         'typing_extensions; python_version < "3.8.0"',
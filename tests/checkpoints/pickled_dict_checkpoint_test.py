@@ -0,0 +1,66 @@
+"""Tests for the pickled dict checkpoint."""
+
+import io
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from git_theta.checkpoints import pickled_dict_checkpoint
+
+
+class NotATensor:
+    pass
+
+
+@pytest.fixture
+def fake_model():
+    return {"layer1/weight": torch.randn(10, 5), "layer1/bias": torch.randn(10)}
+
+
+def check_loaded(loaded, model):
+    assert loaded.keys() == model.keys()
+    for name, value in model.items():
+        np.testing.assert_array_equal(loaded[name].numpy(), value.numpy())
+
+
+def test_load(fake_model, tmp_path):
+    checkpoint_path = tmp_path / "model.pt"
+    torch.save(fake_model, checkpoint_path)
+    loaded = pickled_dict_checkpoint.PickledDictCheckpoint.load(str(checkpoint_path))
+    check_loaded(loaded, fake_model)
+
+
+def test_load_legacy_format(fake_model, tmp_path):
+    checkpoint_path = tmp_path / "model.pt"
+    torch.save(fake_model, checkpoint_path, _use_new_zipfile_serialization=False)
+    loaded = pickled_dict_checkpoint.PickledDictCheckpoint.load(str(checkpoint_path))
+    check_loaded(loaded, fake_model)
+
+
+def test_load_file_object(fake_model):
+    buffer = io.BytesIO()
+    torch.save(fake_model, buffer)
+    buffer.seek(0)
+    loaded = pickled_dict_checkpoint.PickledDictCheckpoint.load(buffer)
+    check_loaded(loaded, fake_model)
+
+
+def test_load_arbitrary_objects(tmp_path):
+    checkpoint_path = tmp_path / "model.pt"
+    torch.save({"layer1/weight": NotATensor()}, checkpoint_path)
+    with pytest.raises(ValueError, match="must be tensors"):
+        pickled_dict_checkpoint.PickledDictCheckpoint.load(str(checkpoint_path))
+
+
+@pytest.mark.parametrize("low_memory", ["", "True"])
+def test_save_round_trip(fake_model, tmp_path, monkeypatch, low_memory):
+    monkeypatch.setenv("GIT_THETA_LOW_MEMORY", low_memory)
+    checkpoint_path = tmp_path / "model.pt"
+    checkpoint = pickled_dict_checkpoint.PickledDictCheckpoint.from_framework(
+        fake_model
+    )
+    checkpoint.save(str(checkpoint_path))
+    loaded = pickled_dict_checkpoint.PickledDictCheckpoint.load(str(checkpoint_path))
+    check_loaded(loaded, fake_model)
@@ -1,5 +1,6 @@
 """safetensors checkpoint tests."""
 
+import io
 import operator as op
 import os
 
@@ -38,6 +39,17 @@ def test_round_trip(fake_model):
         np.testing.assert_array_equal(og, new)
 
 
+def test_round_trip_file_object(fake_model):
+    ckpt = safetensors_checkpoint.SafeTensorsCheckpoint(fake_model)
+    buffer = io.BytesIO()
+    ckpt.save(buffer)
+    buffer.seek(0)
+    ckpt2 = safetensors_checkpoint.SafeTensorsCheckpoint.from_file(buffer)
+    assert ckpt.keys() == ckpt2.keys()
+    for k, og in ckpt.items():
+        np.testing.assert_array_equal(og, ckpt2[k])
+
+
 def test_get_checkpoint_handler_safetensors():
     for alias in ("safetensors", "safetensors-checkpoint"):
         out = checkpoints.get_checkpoint_handler(alias)
@@ -0,0 +1,93 @@
+"""Tests for filters.py"""
+
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from git_theta import checkpoints, filters, git_utils, metadata
+
+
+@pytest.fixture
+def in_memory_lfs(monkeypatch):
+    """Replace git-lfs clean/smudge with an in-memory object store."""
+    objects = {}
+
+    async def git_lfs_clean(file_contents):
+        oid = hashlib.sha256(file_contents).hexdigest()
+        objects[oid] = file_contents
+        return f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {len(file_contents)}\n"
+
+    async def git_lfs_smudge(pointer_file):
+        return objects[metadata.LfsMetadata.from_pointer(pointer_file).oid]
+
+    monkeypatch.setattr(git_utils, "git_lfs_clean", git_lfs_clean)
+    monkeypatch.setattr(git_utils, "git_lfs_smudge", git_lfs_smudge)
+    return objects
+
+
+def commit_metadata(repo, path, metadata_obj):
+    metadata_obj.write(path)
+    repo.index.add([path])
+    repo.index.commit("update model")
+
+
+def commit_model(repo, path, update_type, monkeypatch):
+    """Clean and commit a model, returning it."""
+    checkpoint_handler = checkpoints.get_checkpoint_handler()
+    model = {
+        "layer1/weight": np.random.rand(20, 10).astype(np.float32),
+        "layer1/bias": np.random.rand(20).astype(np.float32),
+    }
+    commit_metadata(repo, path, filters.clean(checkpoint_handler(model), repo, path))
+    if update_type != "dense":
+        # Incremental updates are calculated from a previous dense value. The
+        # update itself is stored at low precision too, zeroing weights (like
+        # pruning) gives one that is stored exactly, so it can be checked out
+        # without any change.
+        monkeypatch.setenv("GIT_THETA_UPDATE_TYPE", update_type)
+        model["layer1/weight"][0, :5] = 0
+        commit_metadata(
+            repo, path, filters.clean(checkpoint_handler(model), repo, path)
+        )
+    return checkpoint_handler(model)
+
+
+@pytest.mark.parametrize("update_type", ["dense", "sparse"])
+def test_clean_smudge_clean_storage_dtype(
+    update_type, git_repo_with_commits, in_memory_lfs, monkeypatch
+):
+    """Make sure a checked out low precision parameter isn't seen as changed."""
+    monkeypatch.setenv("GIT_THETA_STORAGE_DTYPE", "bfloat16")
+    repo, _, _ = git_repo_with_commits
+    path = os.path.join(repo.working_dir, "model.pt")
+    try:
+        commit_model(repo, path, update_type, monkeypatch)
+        cleaned = metadata.Metadata.from_file(path)
+        checked_out = filters.smudge(cleaned, repo, path)
+        assert filters.clean(checked_out, repo, path) == cleaned
+    finally:
+        git_utils.clear_caches()
+        metadata.clear_caches()
+
+
+@pytest.mark.parametrize("update_type", ["dense", "sparse"])
+def test_clean_clean_storage_dtype(
+    update_type, git_repo_with_commits, in_memory_lfs, monkeypatch
+):
+    """Make sure re-adding an unchanged full precision model doesn't rewrite it."""
+    monkeypatch.setenv("GIT_THETA_STORAGE_DTYPE", "bfloat16")
+    repo, _, _ = git_repo_with_commits
+    path = os.path.join(repo.working_dir, "model.pt")
+    try:
+        model = commit_model(repo, path, update_type, monkeypatch)
+        cleaned = metadata.Metadata.from_file(path)
+        num_objects = len(in_memory_lfs)
+        assert filters.clean(model, repo, path) == cleaned
+        assert len(in_memory_lfs) == num_objects
+    finally:
+        git_utils.clear_caches()
+        metadata.clear_caches()
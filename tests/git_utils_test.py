@@ -1,7 +1,12 @@
 """Tests for git_utils.py"""
 
+import io
 import os
+import stat
+import sys
+from unittest import mock
 
+import git
 import pytest
 
 from git_theta import git_utils
@@ -292,3 +297,114 @@ def test_read_write_gitattributes_read_write_round_trip(gitattributes, tmp_path)
         new_atts = new_f.read()
 
     assert old_atts == new_atts
+
+
+def test_add_files(git_repo_with_commits):
+    repo, _, _ = git_repo_with_commits
+    paths = [os.path.join(repo.working_dir, f"file-{i}.txt") for i in range(3)]
+    for path in paths:
+        with open(path, "w") as f:
+            f.write(path)
+    git_utils.add_files(paths, repo)
+    staged = {entry.a_path for entry in repo.index.diff("HEAD")}
+    assert staged == {os.path.basename(path) for path in paths}
+
+
+def test_add_files_error(git_repo_with_commits):
+    repo, _, _ = git_repo_with_commits
+    directory = os.path.join(repo.working_dir, "directory")
+    os.mkdir(directory)
+    with pytest.raises(git.GitCommandError, match="is a directory"):
+        git_utils.add_files([directory], repo)
+
+
+def test_get_git_repo_is_cached(git_repo_with_commits):
+    repo, _, _ = git_repo_with_commits
+    cwd = os.getcwd()
+    os.chdir(repo.working_dir)
+    try:
+        first = git_utils.get_git_repo()
+        assert git_utils.get_git_repo() is first
+        assert os.path.samefile(first.working_dir, repo.working_dir)
+        git_utils.clear_caches()
+        assert git_utils.get_git_repo() is not first
+    finally:
+        os.chdir(cwd)
+        git_utils.clear_caches()
+
+
+def test_get_gitattributes_tracked_patterns(tmp_path):
+    """Test that only patterns that set all of the git-theta attributes are returned."""
+    gitattributes_file = tmp_path / ".gitattributes"
+    with open(gitattributes_file, "w") as wf:
+        wf.write(
+            "model.pt filter=theta merge=theta diff=theta\n"
+            "*.bin filter=lfs merge=lfs diff=lfs\n"
+            "partial.pt filter=theta\n"
+            "*.ckpt filter=theta merge=theta diff=theta\n"
+        )
+    patterns = git_utils.get_gitattributes_tracked_patterns(gitattributes_file)
+    assert patterns == {"model.pt", "*.ckpt"}
+
+
+def test_write_gitattributes_file_object(gitattributes):
+    """Make sure attributes can be written to an already open file."""
+    attributes_text, _ = gitattributes
+    f = io.StringIO()
+    git_utils.write_gitattributes(f, attributes_text)
+    assert f.getvalue() == "\n".join(attributes_text) + "\n"
+
+
+def test_write_gitattributes_no_temp_file_left(gitattributes, tmp_path):
+    """Make sure the temporary file used for atomic writes is cleaned up."""
+    attr_file = tmp_path / ".gitattributes"
+    git_utils.write_gitattributes(attr_file, gitattributes[0])
+    assert os.listdir(tmp_path) == [".gitattributes"]
+
+
+def test_write_gitattributes_failed_write_cleans_up(gitattributes, tmp_path):
+    """Make sure a failed write leaves the original file and no temporary file."""
+    attr_file = tmp_path / ".gitattributes"
+    attr_file.write_text("original\n")
+    with mock.patch.object(os, "replace", side_effect=OSError):
+        with pytest.raises(OSError):
+            git_utils.write_gitattributes(attr_file, gitattributes[0])
+    assert os.listdir(tmp_path) == [".gitattributes"]
+    assert attr_file.read_text() == "original\n"
+
+
+def test_write_gitattributes_keeps_permissions(gitattributes, tmp_path):
+    """Make sure rewriting .gitattributes keeps the existing file's mode."""
+    attr_file = tmp_path / ".gitattributes"
+    attr_file.write_text("")
+    os.chmod(attr_file, 0o640)
+    git_utils.write_gitattributes(attr_file, gitattributes[0])
+    assert stat.S_IMODE(os.stat(attr_file).st_mode) == 0o640
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+def test_write_gitattributes_follows_symlink(gitattributes, tmp_path):
+    """Make sure a symlinked .gitattributes stays a symlink to the new contents."""
+    target = tmp_path / "shared-gitattributes"
+    target.write_text("")
+    attr_file = tmp_path / ".gitattributes"
+    attr_file.symlink_to(target)
+    git_utils.write_gitattributes(attr_file, gitattributes[0])
+    assert attr_file.is_symlink()
+    assert target.read_text() == "\n".join(gitattributes[0]) + "\n"
+
+
+def test_get_changed_files(git_repo_with_commits):
+    """Test that the changed files match the ones GitPython's commit stats report."""
+    repo, _, _ = git_repo_with_commits
+    paths = [os.path.join(repo.working_dir, p) for p in ("a.txt", "dir with space")]
+    os.mkdir(paths[1])
+    paths[1] = os.path.join(paths[1], "b.txt")
+    for path in paths:
+        with open(path, "w") as f:
+            f.write(path)
+    repo.index.add(paths)
+    commit = repo.index.commit("add files")
+    changed = git_utils.get_changed_files(repo, commit)
+    assert sorted(changed) == sorted(commit.stats.files.keys())
+    assert sorted(changed) == ["a.txt", "dir with space/b.txt"]
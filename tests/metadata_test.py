@@ -2,6 +2,7 @@
 
 import os
 
+import git
 import helpers
 import numpy as np
 import pytest
@@ -88,3 +89,25 @@ def test_metadata_flatten(data_generator):
     metadata_obj_flat = metadata_obj.flatten()
     metadata_obj_unflat = metadata_obj_flat.unflatten()
     assert metadata_equal(metadata_obj, metadata_obj_unflat)
+
+
+def test_get_flat_metadata_is_cached(git_repo_with_commits, data_generator):
+    repo, _, _ = git_repo_with_commits
+    metadata_obj = data_generator.random_metadata()
+    path = os.path.join(repo.working_dir, "model.ckpt")
+    metadata_obj.write(path)
+    repo.index.add([path])
+    commit_hash = repo.index.commit("add metadata").hexsha
+
+    try:
+        flat = metadata.get_flat_metadata(repo, path, commit_hash)
+        assert flat.keys() == metadata_obj.flatten().keys()
+        assert metadata.get_flat_metadata(repo, path, commit_hash) is flat
+        # A different Repo object for the same repository shares the cache.
+        other_repo = git.Repo(repo.working_dir)
+        try:
+            assert metadata.get_flat_metadata(other_repo, path, commit_hash) is flat
+        finally:
+            other_repo.close()
+    finally:
+        metadata.clear_caches()
@@ -1,6 +1,7 @@
 """Tests for params.py"""
 
 import asyncio
+import json
 import random
 
 import numpy as np
@@ -33,6 +34,96 @@ def test_tensorstore_serializer_roundtrip_chunked():
     np.testing.assert_array_equal(t, deserialized_t)
 
 
+def test_tensorstore_serializer_reads_other_compressors():
+    """
+    Test TensorStoreSerializer can deserialize values written with a different compressor
+    """
+    t = np.random.rand(50, 50)
+    blosc_serializer = params.TensorStoreSerializer(
+        {"id": "blosc", "cname": "lz4", "clevel": 5, "shuffle": -1}
+    )
+    serialized_t = asyncio.run(blosc_serializer.serialize(t))
+    deserialized_t = asyncio.run(
+        params.TensorStoreSerializer().deserialize(serialized_t)
+    )
+    np.testing.assert_array_equal(t, deserialized_t)
+
+
+@pytest.mark.parametrize("storage_dtype", ["bfloat16", "float16", "float8_e4m3fn"])
+def test_tensorstore_serializer_storage_dtype(storage_dtype):
+    """
+    Test TensorStoreSerializer stores floats at a lower precision and restores their dtype
+    """
+    serializer = params.TensorStoreSerializer(storage_dtype=storage_dtype)
+    t = np.random.rand(50, 50).astype(np.float32)
+    serialized_t = asyncio.run(serializer.serialize(t))
+    deserialized_t = asyncio.run(
+        params.TensorStoreSerializer().deserialize(serialized_t)
+    )
+    assert deserialized_t.dtype == t.dtype
+    np.testing.assert_allclose(t, deserialized_t, atol=0.1)
+
+
+def test_tensorstore_serializer_storage_dtype_skips_ints():
+    """
+    Test TensorStoreSerializer doesn't change the storage of non-floating point tensors
+    """
+    serializer = params.TensorStoreSerializer(storage_dtype="bfloat16")
+    t = np.random.randint(0, 1000, size=(50, 50))
+    serialized_t = asyncio.run(serializer.serialize(t))
+    deserialized_t = asyncio.run(serializer.deserialize(serialized_t))
+    np.testing.assert_array_equal(t, deserialized_t)
+
+
+def test_tensorstore_serializer_storage_dtype_env_var(monkeypatch):
+    """
+    Test TensorStoreSerializer uses the storage dtype from $GIT_THETA_STORAGE_DTYPE
+    """
+    monkeypatch.setenv("GIT_THETA_STORAGE_DTYPE", "bfloat16")
+    serializer = params.TensorStoreSerializer()
+    t = np.random.rand(50, 50).astype(np.float32)
+    serialized_t = asyncio.run(serializer.serialize(t))
+    assert json.loads(serialized_t[".zarray"])["dtype"] == "bfloat16"
+    deserialized_t = asyncio.run(serializer.deserialize(serialized_t))
+    assert deserialized_t.dtype == t.dtype
+    np.testing.assert_allclose(t, deserialized_t, atol=0.1)
+
+
+@pytest.mark.parametrize(
+    "storage_dtype,value", [("float8_e4m3fn", 1000.0), ("float16", 1e6)]
+)
+def test_tensorstore_serializer_storage_dtype_out_of_range(storage_dtype, value):
+    """
+    Test TensorStoreSerializer refuses to store values the storage dtype can't represent
+    """
+    serializer = params.TensorStoreSerializer(storage_dtype=storage_dtype)
+    t = np.random.rand(50, 50).astype(np.float32)
+    t[0, 0] = -value
+    with pytest.raises(ValueError, match="outside of the range"):
+        asyncio.run(serializer.serialize(t))
+
+
+def test_tensorstore_serializer_stored_value(monkeypatch):
+    """
+    Test TensorStoreSerializer.stored_value matches deserialization and is only converted once
+    """
+    serializer = params.TensorStoreSerializer(storage_dtype="bfloat16")
+    t = np.random.rand(50, 50).astype(np.float32)
+    stored_t = serializer.stored_value(t)
+    assert stored_t.dtype == t.dtype
+    conversions = []
+    to_storage_dtype = serializer.to_storage_dtype
+    monkeypatch.setattr(
+        serializer,
+        "to_storage_dtype",
+        lambda tensor: conversions.append(tensor) or to_storage_dtype(tensor),
+    )
+    serialized_t = asyncio.run(serializer.serialize(stored_t))
+    assert not conversions
+    deserialized_t = asyncio.run(serializer.deserialize(serialized_t))
+    np.testing.assert_array_equal(stored_t, deserialized_t)
+
+
 def test_tar_combiner_roundtrip():
     """
     Test MsgPackCombiner combines and splits correctly
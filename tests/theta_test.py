@@ -4,6 +4,7 @@ import os
 import random
 
 import helpers
+import pytest
 
 from git_theta import theta
 
@@ -32,6 +33,16 @@ def test_get_commit_info(git_repo_with_commits):
         assert theta_commits.get_commit_info(commit_hash) == commit_info
 
 
+def test_get_commit_info_missing(git_repo_with_commits, data_generator):
+    """
+    Test that getting the CommitInfo for a commit without a ThetaCommits entry raises an error
+    """
+    repo, _, _ = git_repo_with_commits
+    theta_commits = theta.ThetaCommits(repo)
+    with pytest.raises(ValueError):
+        theta_commits.get_commit_info(data_generator.random_commit_hash())
+
+
 def test_get_commit_info_range(git_repo_with_commits):
     """
     Test getting the correct CommitInfo objects for a certain commit hash range using a ThetaCommits object
@@ -71,3 +82,16 @@ def test_combine_oid_sets():
     oid_sets = [set([1, 2, 3, 4]), set([1, 2]), set([1, 2, 6])]
     combined_set = set([1, 2, 3, 4, 6])
     assert theta.ThetaCommits.combine_oid_sets(oid_sets) == combined_set
+
+
+def test_write_commit_info_duplicate(git_repo_with_commits, data_generator):
+    """
+    Test that writing CommitInfo for a commit that already has an entry raises an error
+    """
+    repo, commit_hashes, commit_infos = git_repo_with_commits
+    theta_commits = theta.ThetaCommits(repo)
+    with pytest.raises(ValueError):
+        theta_commits.write_commit_info(
+            commit_hashes[0], data_generator.random_commit_info()
+        )
+    assert theta_commits.get_commit_info(commit_hashes[0]) == commit_infos[0]
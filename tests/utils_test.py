@@ -26,6 +26,16 @@ def test_flatten_dict_empty():
     assert utils.flatten({}) == {}
 
 
+def test_flatten_preserves_insertion_order():
+    nested = {"b": {"d": 1, "c": {"e": 2}}, "a": 3, "f": {"g": 4}}
+    assert list(utils.flatten(nested).keys()) == [
+        ("b", "d"),
+        ("b", "c", "e"),
+        ("a",),
+        ("f", "g"),
+    ]
+
+
 def test_sorted_flatten_dict_insertion_order():
     """Test that key order is consistent for different insertion order."""
     nested_dict = {
@@ -113,3 +123,11 @@ def test_touch(test_file):
     new_stats = os.stat(test_file)
     assert old_stats.st_atime < new_stats.st_atime
     assert old_stats.st_mtime < new_stats.st_mtime
+
+
+def test_load_json_allows_nan():
+    assert utils.load_json('{"a": [1, 2], "b": NaN}')["a"] == [1, 2]
+
+
+def test_load_json_bytes():
+    assert utils.load_json(b'{"a": {"b": "c"}}') == {"a": {"b": "c"}}